@@ -9,7 +9,10 @@ Generates 10×20 ideogram strips. 100% round-trip token accuracy.
 Usage:
     python numcode.py
 
-Requires: pip install Pillow
+Optional dependencies:
+    Pillow — PNG strips (without it, strips are written as raw PBM)
+    numpy  — vectorized strip rendering and reading
+    numba  — native batch kernel for strip cell computation
 Dictionaries: Place GOLD_*.txt files in ./dictionaries/
 
 Created by Fernando · THE HIVE Project · February 2026
@@ -17,13 +20,25 @@ License: MIT
 """
 
 import os
+import pickle
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 try:
     from PIL import Image
 except ImportError:
     Image = None
     print("Warning: Pillow not installed. Ideogram strips disabled.")
     print("Install with: pip install Pillow")
+try:
+    import numpy as np
+except ImportError:
+    np = None  # optional; strips fall back to per-pixel writes
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # optional; batch strip generation falls back to Python
 
 # ---- CONFIGURATION ----
 
@@ -41,9 +56,43 @@ DATA_TYPES = {'bin':(18,6),'enc':(18,7),'so':(18,8),'im':(18,9)}
 DATA_TYPES_INV = {v:k for k,v in DATA_TYPES.items()}
 SUFFIXES = {'s':(13,7),'r':(13,8),'n':(13,9)}
 SUFFIXES_INV = {v:k for k,v in SUFFIXES.items()}
+_SUFFIX_CODES = {'s': 1, 'r': 2, 'n': 3}  # integer codes for the jit kernel
 
 PUNCT_ATTACH_RIGHT = {'.', ',', ';', ':', '!', '?', ')', '"', "'", '-'}
 
+# Strips are PNG via Pillow when available, raw 1-bit PBM (P4) otherwise
+STRIP_FILE = 'strip.png' if Image is not None else 'strip.pbm'
+
+# Re-read and verify every generated strip (doubles the work per input);
+# off by default, opt in with NUMCODE_VERIFY=1 for CI and benchmarks.
+VERIFY = os.environ.get('NUMCODE_VERIFY') == '1'
+
+# Precompiled patterns (re's internal cache is small; compile once at import)
+_TOK_AR = re.compile(
+    r"[\u0600-\u06FF\u0750-\u077F]+|[0-9]+|[a-zA-Z']+|[.,;:!?()\"'\-]")
+_TOK_DEFAULT = re.compile(
+    r"[a-zA-Z\u00e0-\u024f\u00c0-\u024f']+|[0-9]+|[.,;:!?()\"'\-]")
+_NUM_RE = re.compile(r'^[0-9]+$')
+_TOKEN_RE = re.compile(r'(\d+)([bnsr]?)', re.IGNORECASE)
+# Fused tokenize+classify patterns for encode(): the named group tells
+# numbers apart from dictionary tokens without a second regex pass.
+_ENCODE_RE_AR = re.compile(
+    r"(?P<num>[0-9]+)"
+    r"|(?P<word>[\u0600-\u06FF\u0750-\u077F]+|[a-zA-Z']+)"
+    r"|(?P<punct>[.,;:!?()\"'\-])")
+_ENCODE_RE_DEFAULT = re.compile(
+    r"(?P<num>[0-9]+)"
+    r"|(?P<word>[a-zA-Z\u00e0-\u024f\u00c0-\u024f']+)"
+    r"|(?P<punct>[.,;:!?()\"'\-])")
+_SENT_CAP = re.compile(r'([.!?])\s+([a-záéíóúàèìòùâêîôûäëïöüç])')
+_LANG_ZH = re.compile(r'[\u4e00-\u9fff]')
+_LANG_AR = re.compile(r'[\u0600-\u06FF]')
+# Marker-word sets for Latin-script languages; one hashed set intersection
+# replaces a regex scan per language.
+_EN_WORDS = frozenset("the is are was were have has will would could".split())
+_FR_WORDS = frozenset("le les une est sont avec pour dans qui mais".split())
+_PUNCT_TO_SPACE = str.maketrans({p: ' ' for p in PUNCT_ATTACH_RIGHT | {'('}})
+
 # ---- LOAD DICTIONARIES ----
 
 print("=== NUMCODE v4 ===")
@@ -52,80 +101,155 @@ print("Loading dictionaries...", flush=True)
 dicts_encode = {}
 dicts_decode = {}
 
-for lang, filename in LANG_FILES.items():
+# Parsed dictionaries are cached to a pickle sidecar keyed by source mtimes,
+# so subsequent launches skip the text parse entirely.
+CACHE_FILE = os.path.join(DICT_DIR, 'dicts.cache')
+CACHE_VERSION = 3  # bump when the parsed-dict layout changes
+
+def _dict_mtimes():
+    """mtime of each dictionary source file, keyed by language."""
+    mtimes = {}
+    for lang, filename in LANG_FILES.items():
+        path = os.path.join(DICT_DIR, filename)
+        if os.path.exists(path):
+            mtimes[lang] = os.path.getmtime(path)
+    return mtimes
+
+def _load_cache(mtimes):
+    """Load cached dicts if the cache matches the current source files."""
+    if not os.path.exists(CACHE_FILE):
+        return None
+    try:
+        with open(CACHE_FILE, 'rb') as f:
+            version, cached_mtimes, enc_dicts, dec_dicts = pickle.load(f)
+    except Exception:
+        return None  # stale or corrupt cache; fall back to the text parse
+    if version != CACHE_VERSION or cached_mtimes != mtimes:
+        return None
+    return enc_dicts, dec_dicts
+
+def _load_one(lang, filename):
+    """Parse one GOLD_*.txt dictionary. Returns (lang, enc, dec) or None."""
     path = os.path.join(DICT_DIR, filename)
     if not os.path.exists(path):
-        continue
-    enc = {}
-    dec = {}
-    with open(path, 'r', encoding='utf-8') as f:
-        f.readline()  # skip header
-        for line in f:
-            p = line.strip().split('\t')
-            if len(p) >= 3:
-                token = p[1].strip()
-                tid = int(p[0])
-                enc[token] = tid
-                dec[tid] = token
-    dicts_encode[lang] = enc
-    dicts_decode[lang] = dec
-    print(f"  {lang}: {len(enc):,} tokens", flush=True)
+        return None
+    with open(path, 'r', encoding='utf-8', buffering=1<<20) as f:
+        lines = f.read().splitlines()
+    pairs = [line.split('\t', 2) for line in lines[1:]]  # lines[0] is the header
+    # Intern tokens so encode and decode share one string object per entry;
+    # ids are dense, so the decode side is a flat tid-indexed list.
+    entries = [(int(p[0]), sys.intern(p[1].strip()))
+               for p in pairs if len(p) >= 3]
+    enc = {token: tid for tid, token in entries}
+    dec = [None] * (1 + max(tid for tid, _ in entries)) if entries else []
+    for tid, token in entries:
+        dec[tid] = token
+    # Alias mixed-case tokens to their lowercase form so encode() needs a
+    # single lookup; existing lowercase entries keep priority.
+    if lang != 'zh':
+        for token, tid in list(enc.items()):
+            lower = token.lower()
+            if lower not in enc:
+                enc[lower] = tid
+    return lang, enc, dec
+
+_mtimes = _dict_mtimes()
+_cached = _load_cache(_mtimes)
+
+if _cached is not None:
+    dicts_encode, dicts_decode = _cached
+    for lang in dicts_encode:
+        print(f"  {lang}: {len(dicts_encode[lang]):,} tokens (cached)", flush=True)
+else:
+    # File reads release the GIL, so the six dictionaries load concurrently
+    with ThreadPoolExecutor(max_workers=len(LANG_FILES)) as _pool:
+        _futures = [_pool.submit(_load_one, lang, filename)
+                    for lang, filename in LANG_FILES.items()]
+        for _future in _futures:
+            loaded = _future.result()
+            if loaded is None:
+                continue
+            lang, enc, dec = loaded
+            dicts_encode[lang] = enc
+            dicts_decode[lang] = dec
+            print(f"  {lang}: {len(enc):,} tokens", flush=True)
+    if dicts_encode:
+        try:
+            with open(CACHE_FILE, 'wb') as f:
+                pickle.dump((CACHE_VERSION, _mtimes, dicts_encode, dicts_decode),
+                            f, protocol=5)
+        except OSError:
+            pass  # read-only dictionary dir; just re-parse next launch
 
 print(f"\nReady. {len(dicts_encode)} languages loaded.\n")
 
 # ---- TOKENIZER ----
 
+def _tok_zh(text):
+    return list(text.replace(' ', ''))
+
+def _tok_ar(text):
+    return _TOK_AR.findall(text)
+
+def _tok_default(text):
+    return _TOK_DEFAULT.findall(text.lower())
+
+_TOKENIZERS = {'zh': _tok_zh, 'ar': _tok_ar}
+
 def tokenize(text, lang):
     """Split text into tokens based on language."""
-    if lang == 'zh':
-        return list(text.replace(' ', ''))
-    elif lang == 'ar':
-        return re.findall(
-            r"[\u0600-\u06FF\u0750-\u077F]+|[0-9]+|[a-zA-Z']+|[.,;:!?()\"'\-]", text)
-    else:
-        return re.findall(
-            r"[a-zA-Z\u00e0-\u024f\u00c0-\u024f']+|[0-9]+|[.,;:!?()\"'\-]", text.lower())
+    return _TOKENIZERS.get(lang, _tok_default)(text)
 
 # ---- ENCODER ----
 
 def encode(text, lang):
-    """Encode text to NumCode sequence. Returns list of ID+suffix strings."""
+    """Encode text to NumCode sequence. Returns list of (id, suffix) tuples."""
     if lang not in dicts_encode:
         return []
     enc = dicts_encode[lang]
-    tokens = tokenize(text, lang)
 
-    # Phase 1: raw encoding
+    # Phase 1: raw encoding (tokenize and classify in a single regex pass)
     raw = []
     not_found = []
-    for t in tokens:
-        if re.match(r'^[0-9]+$', t):
-            raw.append(f"{t}n")
-        else:
-            t_lower = t.lower() if lang != 'zh' else t
-            if t_lower in enc:
-                raw.append(f"{enc[t_lower]}b")
+    if lang == 'zh':
+        for t in tokenize(text, lang):
+            if _NUM_RE.match(t):
+                raw.append((int(t), 'n'))
             elif t in enc:
-                raw.append(f"{enc[t]}b")
+                raw.append((enc[t], 'b'))
             else:
                 not_found.append(t)
+    else:
+        mixed_case = lang == 'ar'  # default languages are lowered up front
+        pattern = _ENCODE_RE_AR if mixed_case else _ENCODE_RE_DEFAULT
+        source = text if mixed_case else text.lower()
+        for m in pattern.finditer(source):
+            t = m.group()
+            if m.lastgroup == 'num':
+                raw.append((int(t), 'n'))
+            else:
+                tid = enc.get(t.lower() if mixed_case else t)
+                if tid is not None:
+                    raw.append((tid, 'b'))
+                else:
+                    not_found.append(t)
     if not_found:
         print(f"  Not found ({len(not_found)}): {', '.join(not_found[:10])}")
 
     # Phase 2: repetition compression
     result = []
-    i = 0
-    while i < len(raw):
-        count = 1
-        while i + count < len(raw) and raw[i + count] == raw[i]:
-            count += 1
-        result.append(raw[i])
+    for key, group in groupby(raw):
+        count = sum(1 for _ in group)
+        result.append(key)
         if count > 1:
-            result.append(f"{count}r")
-        i += count
+            result.append((count, 'r'))
 
     return result
 
+def to_numcode_str(ids):
+    """Render a list of (id, suffix) tuples as a NumCode string."""
+    return ' '.join(f"{n}{s}" for n, s in ids)
+
 # ---- DECODER ----
 
 def decode(numcode_str, lang):
@@ -137,16 +261,11 @@ def decode(numcode_str, lang):
     words = []
 
     for token in tokens:
-        suffix = None
-        num_str = ''
-        for ch in token:
-            if ch.isdigit():
-                num_str += ch
-            elif ch in 'bnsr':
-                suffix = ch
-        if not num_str:
+        m = _TOKEN_RE.match(token)
+        if not m:
             continue
-        tid = int(num_str)
+        tid = int(m.group(1))
+        suffix = m.group(2).lower() or None
 
         if suffix == 'n':
             words.append(str(tid))
@@ -158,10 +277,8 @@ def decode(numcode_str, lang):
         elif suffix == 's':
             pass  # sparse padding, skip
         else:  # 'b' or default
-            if tid in dec:
-                words.append(dec[tid])
-            else:
-                words.append(f"[?{tid}]")
+            tok = dec[tid] if tid < len(dec) else None
+            words.append(tok if tok is not None else f"[?{tid}]")
 
     # Reconstruct text with proper punctuation
     if lang == 'zh':
@@ -170,177 +287,347 @@ def decode(numcode_str, lang):
     if not words:
         return ""
 
-    parts = []
-    for i, w in enumerate(words):
-        if i == 0:
-            parts.append(w)
-        elif w in PUNCT_ATTACH_RIGHT:
-            parts.append(w)
-        elif parts and parts[-1] and parts[-1][-1] in ('(',):
-            parts.append(w)
-        else:
-            parts.append(' ' + w)
+    # Interleave separator spaces as their own list items; a single join
+    # at the end avoids allocating a ' ' + w string per word.
+    parts = [words[0]]
+    for w in words[1:]:
+        if w not in PUNCT_ATTACH_RIGHT and not parts[-1].endswith('('):
+            parts.append(' ')
+        parts.append(w)
 
     text = ''.join(parts)
 
     # Capitalize first letter of each sentence
     if text:
         text = text[0].upper() + text[1:]
-        text = re.sub(
-            r'([.!?])\s+([a-záéíóúàèìòùâêîôûäëïöüç])',
-            lambda m: m.group(1) + ' ' + m.group(2).upper(), text)
+        if any(p in text for p in '.!?'):  # cheap scan before the regex
+            text = _SENT_CAP.sub(
+                lambda m: m.group(1) + ' ' + m.group(2).upper(), text)
 
     return text
 
 # ---- IDEOGRAM GRID ----
 
+# Cell coordinate tables, indexed by digit value (Protocol Spec v6.8).
+# Units: 3×3 block, rows 14-16, cols 7-9, inverted spiral.
+_UNITS = (None, (16,9), (16,8), (16,7), (15,9), (15,8), (15,7),
+          (14,9), (14,8), (14,7))
+_TENS_LOW = (None, (17,6), (16,6), (15,6), (14,6), (13,6))
+_TENS_HIGH = (None, None, None, None, None, None,
+              (12,6), (12,7), (12,8), (12,9))
+# Hundreds through billions: (place value, column)
+_PLACE_COLS = ((100,7), (1000,8), (10000,9), (100000,6), (1000000,5),
+               (10000000,4), (100000000,3), (1000000000,2))
+
+if np is not None:
+    # 0-based index arrays over the tables above, for vectorized reads
+    _NP_DIGITS = np.arange(1, 10)
+    _NP_UNIT_ROWS = np.array([r-1 for r, c in _UNITS[1:]])
+    _NP_UNIT_COLS = np.array([c-1 for r, c in _UNITS[1:]])
+    _NP_TENS_LOW_ROWS = np.array([r-1 for r, c in _TENS_LOW[1:]])
+    _NP_TENS_LOW_COLS = np.array([c-1 for r, c in _TENS_LOW[1:]])
+    _NP_TENS_HIGH_ROWS = np.array([r-1 for r, c in _TENS_HIGH[6:]])
+    _NP_TENS_HIGH_COLS = np.array([c-1 for r, c in _TENS_HIGH[6:]])
+    _NP_PLACE_ROWS = 11 - _NP_DIGITS  # digit v sits on row 12-v (1-based)
+
+if np is not None and njit is not None:
+    _NB_PLACES = np.array([p for p, _ in _PLACE_COLS], dtype=np.int64)
+    _NB_PLACE_COLS = np.array([c-1 for _, c in _PLACE_COLS], dtype=np.int64)
+
+    @njit(cache=True)
+    def _cells_kernel(numbers, suffix_codes, offset, out_rows, out_cols):
+        """Fill out_rows/out_cols with the active cells of every block.
+
+        Native-compiled version of the id_to_cells() math for a whole
+        batch of ids; returns the number of cells written.
+        """
+        count = 0
+        for i in range(numbers.shape[0]):
+            n = numbers[i]
+            base = (i + offset) * 10
+            u = n % 10
+            if u > 0:
+                out_rows[count] = _NP_UNIT_ROWS[u-1]
+                out_cols[count] = base + _NP_UNIT_COLS[u-1]
+                count += 1
+            d = (n // 10) % 10
+            if d > 0:
+                if d <= 5:
+                    out_rows[count] = _NP_TENS_LOW_ROWS[d-1]
+                    out_cols[count] = base + _NP_TENS_LOW_COLS[d-1]
+                else:
+                    out_rows[count] = _NP_TENS_HIGH_ROWS[d-6]
+                    out_cols[count] = base + _NP_TENS_HIGH_COLS[d-6]
+                count += 1
+            for k in range(_NB_PLACES.shape[0]):
+                digit = (n // _NB_PLACES[k]) % 10
+                if digit > 0:
+                    out_rows[count] = 11 - digit
+                    out_cols[count] = base + _NB_PLACE_COLS[k]
+                    count += 1
+            s = suffix_codes[i]
+            if s > 0:  # suffix cells sit on row 13, cols 7-9
+                out_rows[count] = 12
+                out_cols[count] = base + 5 + s
+                count += 1
+        return count
+
 def id_to_cells(number):
     """Convert numeric ID to list of active cell coordinates (row, col)."""
     cells = []
-    # Units (3×3 block, rows 14-16, cols 7-9, inverted spiral)
+    # Units
     u = number % 10
     if u > 0:
-        pos = {9:(14,7),8:(14,8),7:(14,9),6:(15,7),5:(15,8),4:(15,9),
-               3:(16,7),2:(16,8),1:(16,9)}
-        cells.append(pos[u])
+        cells.append(_UNITS[u])
     # Tens
     d = (number // 10) % 10
     if d > 0:
-        if d <= 5:
-            pos = {1:(17,6),2:(16,6),3:(15,6),4:(14,6),5:(13,6)}
-            cells.append(pos[d])
-        else:
-            pos = {6:(12,6),7:(12,7),8:(12,8),9:(12,9)}
-            cells.append(pos[d])
+        cells.append(_TENS_LOW[d] if d <= 5 else _TENS_HIGH[d])
     # Hundreds through Billions
-    for place, col in [(100,7),(1000,8),(10000,9),(100000,6),(1000000,5),
-                        (10000000,4),(100000000,3),(1000000000,2)]:
+    for place, col in _PLACE_COLS:
         digit = (number // place) % 10
         if digit > 0:
             cells.append((11-(digit-1), col))
     return cells
 
-def create_strip(token_list, lang=None, data_type=None, filename="strip.png"):
-    """Generate ideogram strip as PNG image."""
-    if Image is None:
+_PBM_HEADER = re.compile(rb'P4\s+(\d+)\s+(\d+)\s')
+
+def save_pbm(buf, width, height, path):
+    """Write a grayscale byte buffer as a packed 1-bit PBM (P4) file."""
+    if np is not None:
+        bits = np.frombuffer(buf, dtype=np.uint8).reshape(height, width) < 128
+        packed = np.packbits(bits, axis=1).tobytes()
+    else:
+        row_bytes = (width + 7) // 8
+        packed = bytearray(row_bytes * height)
+        for y in range(height):
+            base = y * width
+            for x in range(width):
+                if buf[base + x] < 128:
+                    packed[y*row_bytes + x//8] |= 0x80 >> (x % 8)
+    with open(path, 'wb') as f:
+        f.write(f"P4\n{width} {height}\n".encode())
+        f.write(bytes(packed))
+
+def load_pbm(path):
+    """Read a P4 PBM file. Returns (grayscale byte buffer, width, height)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    m = _PBM_HEADER.match(data)
+    if not m:
+        return None
+    width, height = int(m.group(1)), int(m.group(2))
+    packed = data[m.end():]
+    row_bytes = (width + 7) // 8
+    if np is not None:
+        bits = np.unpackbits(
+            np.frombuffer(packed, dtype=np.uint8).reshape(height, row_bytes),
+            axis=1)[:, :width]
+        buf = np.where(bits, 0, 255).astype(np.uint8).tobytes()
+    else:
+        buf = bytearray(b'\xff' * (width * height))
+        for y in range(height):
+            for x in range(width):
+                if packed[y*row_bytes + x//8] & (0x80 >> (x % 8)):
+                    buf[y*width + x] = 0
+    return buf, width, height
+
+def create_strip(token_list, lang=None, data_type=None, filename=STRIP_FILE):
+    """Generate ideogram strip as a PNG (or PBM) image."""
+    if Image is None and not filename.endswith('.pbm'):
         return 0
     has_header = lang or data_type
     total = len(token_list) + (1 if has_header else 0)
-    img = Image.new('1', (10 * total, 20), color=1)
+    offset = 1 if has_header else 0
 
-    # Header block
+    # Collect every active cell as (row, col) on the full strip, header
+    # included, then write them all into a single frame at the end.
+    rows = []
+    cols = []
     if has_header:
-        header = Image.new('1', (10, 20), color=1)
-        px = header.load()
         if lang and lang in LANG_CELLS:
             r, c = LANG_CELLS[lang]
-            px[c-1, r-1] = 0
+            rows.append(r-1)
+            cols.append(c-1)
         if data_type and data_type in DATA_TYPES:
             r, c = DATA_TYPES[data_type]
-            px[c-1, r-1] = 0
-        img.paste(header, (0, 0))
-
-    offset = 1 if has_header else 0
-    for i, token in enumerate(token_list):
-        block = Image.new('1', (10, 20), color=1)
-        px = block.load()
-        num_str = ''.join(ch for ch in token if ch.isdigit())
-        suffix = None
-        for ch in token:
-            if ch in 'snrSNR':
-                suffix = ch.lower()
-        if not num_str:
-            continue
-        cells = id_to_cells(int(num_str))
-        if suffix and suffix in SUFFIXES:
-            cells.append(SUFFIXES[suffix])
-        for row, col in cells:
-            if 0 <= row-1 < 20 and 0 <= col-1 < 10:
-                px[col-1, row-1] = 0
-        img.paste(block, ((i + offset) * 10, 0))
-
-    img.save(filename)
+            rows.append(r-1)
+            cols.append(c-1)
+
+    # Token cells go through the native batch kernel when numba is
+    # available and the caller passed (id, suffix) tuples from encode().
+    kcount = 0
+    if (np is not None and njit is not None and token_list
+            and all(isinstance(t, tuple) for t in token_list)):
+        numbers = np.array([n for n, _ in token_list], dtype=np.int64)
+        codes = np.array([_SUFFIX_CODES.get(s, 0) for _, s in token_list],
+                         dtype=np.int64)
+        krows = np.empty(11 * len(token_list), dtype=np.int64)  # ≤11 cells/block
+        kcols = np.empty(11 * len(token_list), dtype=np.int64)
+        kcount = _cells_kernel(numbers, codes, offset, krows, kcols)
+    else:
+        for i, token in enumerate(token_list):
+            if isinstance(token, tuple):  # (id, suffix) straight from encode()
+                number, suffix = token
+            else:
+                m = _TOKEN_RE.match(token)
+                if not m:
+                    continue
+                number = int(m.group(1))
+                suffix = m.group(2).lower() or None
+            cells = id_to_cells(number)
+            if suffix and suffix in SUFFIXES:
+                cells.append(SUFFIXES[suffix])
+            base = (i + offset) * 10
+            for row, col in cells:
+                if 0 <= row-1 < 20 and 0 <= col-1 < 10:
+                    rows.append(row-1)
+                    cols.append(base + col-1)
+
+    width = 10 * total
+    if np is not None:
+        arr = np.full((20, width), 255, dtype=np.uint8)
+        if rows:
+            arr[rows, cols] = 0
+        if kcount:
+            arr[krows[:kcount], kcols[:kcount]] = 0
+        if filename.endswith('.pbm'):
+            save_pbm(arr.tobytes(), width, 20, filename)
+        else:
+            Image.fromarray(arr, mode='L').convert('1').save(filename)
+    elif filename.endswith('.pbm'):
+        buf = bytearray(b'\xff' * (20 * width))
+        for row, col in zip(rows, cols):
+            buf[row*width + col] = 0
+        save_pbm(buf, width, 20, filename)
+    else:
+        img = Image.new('1', (width, 20), color=1)
+        px = img.load()
+        for row, col in zip(rows, cols):
+            px[col, row] = 0
+        img.save(filename)
     return total
 
-def read_cell(pixels, block_x, row, col):
+def read_cell(buf, stride, block_x, row, col):
     """Check if a cell is active in the strip."""
-    return pixels[block_x*10+(col-1), row-1] == 0
+    return buf[(row-1)*stride + block_x*10 + (col-1)] < 128
 
-def read_header(pixels, block_x):
+def read_header(buf, stride, block_x):
     """Read language and data type from header block."""
     lang = None
     dtype = None
     for (r,c), l in LANG_CELLS_INV.items():
-        if read_cell(pixels, block_x, r, c):
+        if read_cell(buf, stride, block_x, r, c):
             lang = l
             break
     for (r,c), t in DATA_TYPES_INV.items():
-        if read_cell(pixels, block_x, r, c):
+        if read_cell(buf, stride, block_x, r, c):
             dtype = t
             break
     return lang, dtype
 
-def read_block(pixels, block_x):
+def read_block(buf, stride, block_x):
     """Read a single ideogram block and return (number, suffix)."""
     number = 0
     suffix = 'b'
 
     # Units
-    pos_u = {9:(14,7),8:(14,8),7:(14,9),6:(15,7),5:(15,8),4:(15,9),
-             3:(16,7),2:(16,8),1:(16,9)}
-    for v,(r,c) in pos_u.items():
-        if read_cell(pixels, block_x, r, c):
+    for v in range(1, 10):
+        r, c = _UNITS[v]
+        if read_cell(buf, stride, block_x, r, c):
             number += v
             break
 
     # Tens high
     found = False
-    for v,(r,c) in {6:(12,6),7:(12,7),8:(12,8),9:(12,9)}.items():
-        if read_cell(pixels, block_x, r, c):
+    for v in range(6, 10):
+        r, c = _TENS_HIGH[v]
+        if read_cell(buf, stride, block_x, r, c):
             number += v*10
             found = True
             break
     if not found:
-        for v,(r,c) in {1:(17,6),2:(16,6),3:(15,6),4:(14,6),5:(13,6)}.items():
-            if read_cell(pixels, block_x, r, c):
+        for v in range(1, 6):
+            r, c = _TENS_LOW[v]
+            if read_cell(buf, stride, block_x, r, c):
                 number += v*10
                 break
 
     # Hundreds through Billions
-    for place, col in [(100,7),(1000,8),(10000,9),(100000,6),(1000000,5),
-                        (10000000,4),(100000000,3),(1000000000,2)]:
+    for place, col in _PLACE_COLS:
         for v in range(1,10):
             row = 11-(v-1)
             if place == 100000 and row >= 12:
                 continue
-            if read_cell(pixels, block_x, row, col):
+            if read_cell(buf, stride, block_x, row, col):
                 number += v*place
                 break
 
     # Suffix
     for (r,c), s in SUFFIXES_INV.items():
-        if read_cell(pixels, block_x, r, c):
+        if read_cell(buf, stride, block_x, r, c):
             suffix = s
             break
 
     return number, suffix
 
-def read_strip(filename="strip.png"):
+def _read_blocks_np(active):
+    """Decode every block of a boolean cell array (20, 10*N) in one pass."""
+    n_blocks = active.shape[1] // 10
+    active = active[:, :n_blocks*10]  # ignore a trailing partial block
+    cube = active.reshape(20, n_blocks, 10).transpose(1, 0, 2)  # (N, 20, 10)
+
+    numbers = (cube[:, _NP_UNIT_ROWS, _NP_UNIT_COLS] * _NP_DIGITS).sum(axis=1)
+    high = cube[:, _NP_TENS_HIGH_ROWS, _NP_TENS_HIGH_COLS]
+    low = cube[:, _NP_TENS_LOW_ROWS, _NP_TENS_LOW_COLS]
+    numbers += 10 * np.where(high.any(axis=1),
+                             (high * np.arange(6, 10)).sum(axis=1),
+                             (low * np.arange(1, 6)).sum(axis=1))
+    for place, col in _PLACE_COLS:
+        numbers += place * (cube[:, _NP_PLACE_ROWS, col-1] * _NP_DIGITS).sum(axis=1)
+
+    suf = cube[:, 12, 6:9]  # suffix cells s/r/n on row 13
+    suffixes = np.where(suf[:, 0], 's',
+                        np.where(suf[:, 1], 'r',
+                                 np.where(suf[:, 2], 'n', 'b')))
+    return numbers, suffixes
+
+def read_strip(filename=STRIP_FILE):
     """Read an ideogram strip file. Returns (lang, data_type, numcode_string)."""
-    if Image is None:
-        return None, None, ""
-    img = Image.open(filename).convert('1')
-    pixels = img.load()
-    num_blocks = img.size[0] // 10
+    # Either path yields a flat grayscale byte buffer; byte indexing avoids
+    # PIL's PixelAccess getter on every cell read.
+    if filename.endswith('.pbm'):
+        loaded = load_pbm(filename)
+        if loaded is None:
+            return None, None, ""
+        buf, stride, _ = loaded
+    else:
+        if Image is None:
+            return None, None, ""
+        img = Image.open(filename).convert('1')
+        buf = img.convert('L').tobytes()
+        stride = img.size[0]
+    num_blocks = stride // 10
     if num_blocks == 0:
         return None, None, ""
 
-    lang, dtype = read_header(pixels, 0)
+    if np is not None:
+        active = np.frombuffer(buf, dtype=np.uint8).reshape(-1, stride) < 128
+        lang = next((l for (r, c), l in LANG_CELLS_INV.items()
+                     if active[r-1, c-1]), None)
+        dtype = next((t for (r, c), t in DATA_TYPES_INV.items()
+                      if active[r-1, c-1]), None)
+        start = 1 if (lang or dtype) else 0
+        numbers, suffixes = _read_blocks_np(active[:, start*10:])
+        return lang, dtype, ' '.join(
+            f"{n}{s}" for n, s in zip(numbers, suffixes))
+
+    lang, dtype = read_header(buf, stride, 0)
     start = 1 if (lang or dtype) else 0
 
     result = []
     for i in range(start, num_blocks):
-        n, s = read_block(pixels, i)
+        n, s = read_block(buf, stride, i)
         result.append(f"{n}{s}")
 
     return lang, dtype, ' '.join(result)
@@ -349,13 +636,14 @@ def read_strip(filename="strip.png"):
 
 def detect_language(text):
     """Auto-detect language from text content."""
-    if re.search(r'[\u4e00-\u9fff]', text):
+    if _LANG_ZH.search(text):
         return 'zh'
-    if re.search(r'[\u0600-\u06FF]', text):
+    if _LANG_AR.search(text):
         return 'ar'
-    if re.search(r'\b(the|is|are|was|were|have|has|will|would|could)\b', text.lower()):
+    words = set(text.lower().translate(_PUNCT_TO_SPACE).split())
+    if words & _EN_WORDS:
         return 'eng'
-    if re.search(r'\b(le|les|une|est|sont|avec|pour|dans|qui|mais)\b', text.lower()):
+    if words & _FR_WORDS:
         return 'fr'
     # Portuguese detection is limited; defaults to Spanish for similar Romance text
     return 'es'
@@ -381,8 +669,8 @@ def main():
             print("Goodbye!")
             break
         if entrada.lower() in ('leer', 'read'):
-            if os.path.exists('strip.png'):
-                lang, dtype, content = read_strip('strip.png')
+            if os.path.exists(STRIP_FILE):
+                lang, dtype, content = read_strip(STRIP_FILE)
                 print(f"  Language: {lang}")
                 if dtype:
                     print(f"  Data type: {dtype}")
@@ -403,7 +691,7 @@ def main():
             print("  Could not encode")
             continue
 
-        numcode_str = ' '.join(ids)
+        numcode_str = to_numcode_str(ids)
         print(f"  Language: {lang}")
         print(f"  Tokens: {len(ids)}")
         print(f"  NumCode: {numcode_str}")
@@ -411,18 +699,21 @@ def main():
         # Generate strip
         blocks = create_strip(ids, lang=lang)
         if blocks:
-            print(f"  Strip: strip.png ({blocks} blocks)")
-
-        # Verify round-trip
-        lang_r, _, content_r = read_strip('strip.png') if blocks else (lang, None, numcode_str)
-        if not lang_r:
-            lang_r = lang
-            content_r = numcode_str
-        text_r = decode(content_r, lang_r)
-
-        ok = numcode_str == content_r
-        print(f"  Decoded: {text_r}")
-        print(f"  Verification: {'100% PERFECT' if ok else 'ERROR - ' + content_r}")
+            print(f"  Strip: {STRIP_FILE} ({blocks} blocks)")
+
+        if VERIFY:
+            # Verify round-trip through the strip file
+            lang_r, _, content_r = read_strip(STRIP_FILE) if blocks else (lang, None, numcode_str)
+            if not lang_r:
+                lang_r = lang
+                content_r = numcode_str
+            text_r = decode(content_r, lang_r)
+
+            ok = numcode_str == content_r
+            print(f"  Decoded: {text_r}")
+            print(f"  Verification: {'100% PERFECT' if ok else 'ERROR - ' + content_r}")
+        else:
+            print(f"  Decoded: {decode(numcode_str, lang)}")
 
 if __name__ == '__main__':
     main()